@@ -237,8 +237,11 @@ def encode_flac(in_path, out_path, idx, album, track, encode_args, cover_art):
     LOGGER.info("Finished writing %s", out_path)
 
 
-def make_web_preview(input_dir, output_dir, album, protections, futures):
-    """ Generate the embedded preview player """
+def make_web_preview(input_dir, output_dir, album, protections, futures, durations):
+    """ Generate the embedded preview player
+
+    :param dict durations: track index to the future for its duration probe
+    """
     LOGGER.info("Preview: Waiting for %s (%d tasks)", output_dir, len(futures))
     wait_futures(futures)
     LOGGER.info("Preview: Building player in %s", output_dir)
@@ -246,8 +249,11 @@ def make_web_preview(input_dir, output_dir, album, protections, futures):
     from .players import camptown
     player = camptown.Player(art_size=200)
 
-    # filter out all hidden tracks
     album = copy.deepcopy(album)
+    for idx, probe in durations.items():
+        album['tracks'][idx].update(probe.result())
+
+    # filter out all hidden tracks
     album['tracks'] = [track for track in album['tracks']
                        if not track.get('hidden')]
 
@@ -374,10 +380,29 @@ def seconds_to_datetime(duration):
     return f'{minutes:.0f}m {seconds:.0f}s'
 
 
+def probe_duration(in_path):
+    """ Get a track's duration information from its source file
+
+    :param str in_path: Input file path
+
+    :returns: dict of the duration fields for the track metadata
+    """
+    duration = util.get_audio_duration(in_path)
+    return {
+        'duration': duration,
+        'duration_timestamp': seconds_to_timestamp(duration),
+        'duration_datetime': seconds_to_datetime(duration),
+    }
+
+
 def encode_tracks(config, album, protections, pool, futures):
-    """ run the track encode process """
+    """ run the track encode process
+
+    :returns: dict of track index to the future for its duration probe
+    """
 
     encode_files = set()
+    durations = {}
 
     for idx, track in enumerate(album['tracks'], start=1):
         base_filename = f'{idx:02d} '
@@ -406,11 +431,10 @@ def encode_tracks(config, album, protections, pool, futures):
             if os.path.isfile(lyricfile):
                 track['lyrics'] = util.read_lines(lyricfile)
 
-        if input_filename:
-            duration = util.get_audio_duration(input_filename)
-            track['duration'] = duration
-            track['duration_timestamp'] = seconds_to_timestamp(duration)
-            track['duration_datetime'] = seconds_to_datetime(duration)
+        # durations are only used by the web player; probe them in parallel
+        # with the encodes rather than serially up front
+        if config.do_preview and input_filename and not track.get('hidden'):
+            durations[idx - 1] = pool.submit(probe_duration, input_filename)
 
         def enqueue(target, encode_func, input_filename, outfile, *args, **kwargs):
             if input_filename and outfile not in encode_files:
@@ -455,6 +479,8 @@ def encode_tracks(config, album, protections, pool, futures):
                     out_path('flac'),
                     idx, album, track, config.flac_encoder_args, cover_art=1500)
 
+    return durations
+
 
 def make_zipfile(input_dir, output_file, futures):
     """ Make a .zip archive for manual uploading """
@@ -496,7 +522,7 @@ def process(config, album, pool, futures):
 
     .. code-block:: python
 
-        all_futures = list(itertools.chain(*futures.values()))
+        all_futures = list(itertools.chain.from_iterable(futures.values()))
         concurrent.futures.wait(all_futures)
 
     """
@@ -555,7 +581,7 @@ def process(config, album, pool, futures):
             config.input_dir, album['artwork'])
 
     # this populates encode-XXX futures
-    encode_tracks(config, album, protections, pool, futures)
+    durations = encode_tracks(config, album, protections, pool, futures)
 
     # make build block on encode for all targets
     for target in formats:
@@ -568,7 +594,8 @@ def process(config, album, pool, futures):
                                                     os.path.join(config.output_dir,
                                                                  'preview'),
                                                     album, protections['preview'],
-                                                    futures['encode-preview']))
+                                                    futures['encode-preview'],
+                                                    durations))
 
     # make clean block on build for all targets
     for target in formats:
@@ -3,9 +3,7 @@
 import argparse
 import collections
 import concurrent.futures
-import dataclasses
 import itertools
-import json
 import logging
 import os
 import sys
@@ -45,6 +43,9 @@ def parse_args():
     parser.add_argument('--init', dest='init_json', action='store_true',
                         help="Populate the JSON file automatically")
 
+    parser.add_argument('--fail-fast', dest='fail_fast', action='store_true',
+                        help="Cancel all pending tasks after the first error")
+
     for target, description, add_args in (
         ('preview', 'Build web player', True),
         ('mp3', 'Encode mp3 album', True),
@@ -54,13 +55,9 @@ def parse_args():
         ('zip', 'Build a .zip archive', False),
         ('butler', 'Upload to itch.io using Butler', False),
     ):
-        feature = parser.add_mutually_exclusive_group(required=False)
-        fname = f'do_{target}'
-        feature.add_argument(f'--{target}', dest=fname, action='store_true',
-                             help=description)
-        feature.add_argument(f'--no-{target}', dest=fname, action='store_false',
-                             help=f"Don't {description}")
-        feature.set_defaults(**{fname: None})
+        parser.add_argument(f'--{target}', dest=f'do_{target}',
+                            action=argparse.BooleanOptionalAction, default=None,
+                            help=description)
 
         if add_args:
             parser.add_argument(f'--{target}-encoder-args', type=str,
@@ -88,7 +85,7 @@ def get_config(args) -> options.Options:
 
     config = options.Options()
 
-    for field in dataclasses.fields(config):
+    for field in options.fields():
         value = getattr(args, field.name, None)
         if value is not None:
             if field.type == list[str]:
@@ -131,8 +128,7 @@ def main():
         sys.exit(1)
 
     if os.path.isfile(json_file):
-        with open(json_file, 'r', encoding='utf8') as file:
-            album = json.load(file)
+        album = util.read_json(json_file)
     else:
         album = None
 
@@ -141,8 +137,7 @@ def main():
                     json_file, config.input_dir)
         album = util.populate_album(config.input_dir, album)
         LOGGER.info("Album now has %d tracks", len(album['tracks']))
-        with open(json_file, 'w', encoding='utf8') as file:
-            json.dump(album, file)
+        util.write_json(json_file, album)
 
     if not config.output_dir:
         return
@@ -155,18 +150,32 @@ def main():
 
     process(config, album, pool, futures)
 
-    all_tasks = list(itertools.chain(*futures.values()))
+    all_tasks = list(itertools.chain.from_iterable(futures.values()))
     remaining_tasks = [f for f in all_tasks if not f.done()]
     LOGGER.info("Waiting for all tasks to complete... (%d/%d pending)",
                 len(remaining_tasks), len(all_tasks))
 
     errors = []
-    for task in concurrent.futures.as_completed(all_tasks):
-        try:
-            task.result()
-        except Exception as err:  # pylint:disable=broad-exception-caught
-            LOGGER.exception("Background task generated an exception")
-            errors.append(err)
+    pending = set(all_tasks)
+    while pending:
+        done, pending = concurrent.futures.wait(
+            pending, return_when=concurrent.futures.FIRST_COMPLETED)
+
+        for task in done:
+            try:
+                task.result()
+            except concurrent.futures.CancelledError:
+                pass
+            except Exception as err:  # pylint:disable=broad-exception-caught
+                LOGGER.exception("Background task generated an exception")
+                errors.append(err)
+
+        if errors and args.fail_fast:
+            cancelled = [f for f in pending if f.cancel()]
+            pool.shutdown(wait=False, cancel_futures=True)
+            LOGGER.warning("Aborting; cancelled %d pending tasks",
+                           len(cancelled))
+            break
 
     if errors:
         sys.exit(1)
@@ -5,14 +5,13 @@ import argparse
 import collections
 import concurrent.futures
 import copy
-import itertools
+import functools
 import json
 import logging
 import os
 import os.path
 import shutil
 import subprocess
-import threading
 import typing
 
 from PySide6 import QtCore, QtGui, QtWidgets
@@ -25,12 +24,14 @@ from PySide6.QtWidgets import (QApplication, QCheckBox, QDialog, QErrorMessage,
 from .. import __version__, util
 from ..players import camptown
 from . import datatypes, encoder, widgets
-from .file_utils import FileRole
+from .file_utils import DIALOG_OPTIONS, FileRole
 from .track_editor import TrackListEditor
 
 LOG_LEVELS = [logging.WARNING, logging.INFO, logging.DEBUG]
 LOGGER = logging.getLogger(__name__)
 
+MAX_UNDO = 50
+
 
 def add_menu_item(menu, name, method, shortcut=None, role=None):
     """ Add a menu item """
@@ -45,24 +46,33 @@ def add_menu_item(menu, name, method, shortcut=None, role=None):
 
 def get_encode_options():
     """ Get the encoder options """
+    # callers are free to modify their copy
+    return copy.deepcopy(_load_encode_options())
+
+
+@functools.lru_cache()
+def _butler_available(butler_path):
+    """ Check whether the configured butler binary can be found """
+    return bool(butler_path and shutil.which(butler_path))
+
+
+@functools.lru_cache()
+def _load_encode_options():
+    """ Load the encoder options from the settings (cleared by PreferencesWindow.apply) """
 
     from .. import options
 
-    LOGGER.debug("get encode options")
     settings = QtCore.QSettings()
-    LOGGER.debug("get config defaults")
     config = options.Options()
+    known = set(settings.allKeys())
 
     for field in options.fields():
-        LOGGER.debug("get field %s", field.name)
-        if settings.contains(field.name):
-            LOGGER.debug("type=%s value=%s", field.type,
-                         settings.value(field.name))
+        if field.name in known:
+            value = settings.value(field.name)
             if field.type == list[str]:
-                setattr(config, field.name, str(
-                    settings.value(field.name)).split())
+                setattr(config, field.name, str(value).split())
             else:
-                setattr(config, field.name, settings.value(field.name))
+                setattr(config, field.name, value)
 
     return config
 
@@ -77,8 +87,6 @@ class PreferencesWindow(QDialog):
         self.setWindowTitle("Bandcrash Preferences")
         self.setMinimumSize(500, 0)
 
-        defaults = get_encode_options()
-
         def separator():
             frame = QFrame()
             frame.setFrameShape(QFrame.Shape.HLine)
@@ -92,32 +100,25 @@ class PreferencesWindow(QDialog):
         self.num_threads = QSpinBox(self)
         self.num_threads.setMinimum(1)
         self.num_threads.setMaximum(128)
-        self.num_threads.setValue(defaults.num_threads)
         layout.addRow("Number of threads", self.num_threads)
 
         layout.addRow(separator())
 
         self.preview_encoder_args = QLineEdit()
-        self.preview_encoder_args.setText(
-            ' '.join(defaults.preview_encoder_args))
         layout.addRow("Preview encoder options", self.preview_encoder_args)
 
         self.mp3_encoder_args = QLineEdit()
-        self.mp3_encoder_args.setText(' '.join(defaults.mp3_encoder_args))
         layout.addRow("MP3 encoder options", self.mp3_encoder_args)
 
         self.ogg_encoder_args = QLineEdit()
-        self.ogg_encoder_args.setText(' '.join(defaults.ogg_encoder_args))
         layout.addRow("Ogg encoder options", self.ogg_encoder_args)
 
         self.flac_encoder_args = QLineEdit()
-        self.flac_encoder_args.setText(' '.join(defaults.flac_encoder_args))
         layout.addRow("FLAC encoder options", self.flac_encoder_args)
 
         layout.addRow(separator())
 
-        self.butler_path = widgets.FileSelector(
-            FileRole.BINARY, text=defaults.butler_path)
+        self.butler_path = widgets.FileSelector(FileRole.BINARY)
         layout.addRow("Butler binary", self.butler_path)
         connect_button = QPushButton("Connect")
         self.butler_path.layout().addWidget(connect_button)
@@ -136,11 +137,27 @@ class PreferencesWindow(QDialog):
 
         layout.addRow(buttons)
 
+        self.load_options(get_encode_options())
+
         self.accepted.connect(self.apply)
 
+    def load_options(self, config):
+        """ Populate the controls from an Options instance """
+        self.num_threads.setValue(config.num_threads)
+        for widget, args in (
+            (self.preview_encoder_args, config.preview_encoder_args),
+            (self.mp3_encoder_args, config.mp3_encoder_args),
+            (self.ogg_encoder_args, config.ogg_encoder_args),
+            (self.flac_encoder_args, config.flac_encoder_args),
+        ):
+            widget.setText(' '.join(args))
+        self.butler_path.setText(config.butler_path or '')
+
+    @QtCore.Slot()
     def apply(self):
         """ Save the settings out """
         settings = QtCore.QSettings()
+        changed = False
         for key, value in (
             ('num_threads', self.num_threads.value()),
 
@@ -151,30 +168,25 @@ class PreferencesWindow(QDialog):
 
             ('butler_path', self.butler_path.text()),
         ):
-            settings.setValue(key, value)
+            # some backends hand everything back as strings
+            if not settings.contains(key) or str(settings.value(key)) != str(value):
+                settings.setValue(key, value)
+                changed = True
+
+        if changed:
+            settings.sync()
+            _load_encode_options.cache_clear()
+            _butler_available.cache_clear()
 
+    @QtCore.Slot()
     def reset_defaults(self):
         """ Reset to defaults """
         from .. import options
-        defaults = options.Options()
-
-        LOGGER.debug("foo 1")
-
-        self.num_threads.setValue(defaults.num_threads)
-        self.preview_encoder_args.setText(
-            ' '.join(defaults.preview_encoder_args))
-        self.mp3_encoder_args.setText(' '.join(defaults.mp3_encoder_args))
-        self.ogg_encoder_args.setText(' '.join(defaults.ogg_encoder_args))
-        self.flac_encoder_args.setText(' '.join(defaults.flac_encoder_args))
-
-        LOGGER.debug("foo 2")
-
-        self.butler_path.setText(defaults.butler_path)
-
-        LOGGER.debug("foo 3")
 
+        self.load_options(options.Options())
         self.apply()
 
+    @QtCore.Slot()
     def connect_butler(self):
         """ Connect to butler """
         connection = subprocess.run([self.butler_path.text(), 'login', '--assume-yes'],
@@ -268,8 +280,10 @@ class AlbumEditor(QMainWindow):
 
         self.output_dir: typing.Optional[str] = None
 
-        self.undo_history: list[tuple[int, dict[str, typing.Any]]] = []
-        self.redo_history: list[tuple[int, dict[str, typing.Any]]] = []
+        self.undo_history: collections.deque[tuple[int, str]] = collections.deque(
+            maxlen=MAX_UNDO)
+        self.redo_history: collections.deque[tuple[int, str]] = collections.deque(
+            maxlen=MAX_UNDO)
 
         menubar = self.menuBar()
 
@@ -311,7 +325,7 @@ class AlbumEditor(QMainWindow):
         add_menu_item(help_menu, "&Manual", self.open_manual, None)
 
         self.path_delegate = AlbumEditor.PathDelegate(path)
-        self.save_hash = 0
+        self.saved_data: dict[str, typing.Any] = {}
         self.data: dict[str, typing.Any] = {'tracks': []}
         if path:
             self.reload(path)
@@ -408,6 +422,7 @@ class AlbumEditor(QMainWindow):
 
         butler_opts = QHBoxLayout()
         self.do_butler = QCheckBox()
+        self.butler_enabled = None
         self.butler_target = QLineEdit()
         self.butler_target.setPlaceholderText("username/my-album-name")
         self.do_butler.setToolTip(
@@ -428,20 +443,59 @@ class AlbumEditor(QMainWindow):
 
         layout.addRow(buttons)
 
+        self.text_fields = (
+            ('title', self.title),
+            ('genre', self.genre),
+            ('album_url', self.album_url),
+            ('artist_url', self.artist_url),
+            ('artist', self.artist),
+            ('composer', self.composer),
+            ('butler_target', self.butler_target),
+            ('butler_prefix', self.butler_prefix),
+        )
+        self.path_fields = (
+            ('artwork', self.artwork.file_path),
+        )
+        self.checkbox_fields = (
+            ('do_preview', self.do_preview, True),
+            ('do_mp3', self.do_mp3, True),
+            ('do_ogg', self.do_ogg, True),
+            ('do_flac', self.do_flac, True),
+            ('do_zip', self.do_zip, True),
+            ('do_cleanup', self.do_cleanup, True),
+            ('do_butler', self.do_butler, True),
+        )
+        self.theme_colors = (
+            (self.theme_foreground, 'foreground', '#000000'),
+            (self.theme_background, 'background', '#ffffff'),
+            (self.theme_highlight, 'highlight', '#7f0000'),
+        )
+        self.theme_checkbox_fields = (
+            ('hide_footer', self.hide_footer, False),
+        )
+        # fields that apply their edits as the user types
+        self.live_fields = (
+            self.artist,
+            self.title,
+            self.genre,
+            self.composer,
+        )
+
         self.setWindowTitle(self.filename or 'New Album')
 
         self.reset()
 
-        for widget in (
-            self.artist,
-            self.title,
-            self.genre,
-            self.composer
-        ):
-            widget.textChanged.connect(self.apply)
+        # coalesce a burst of keystrokes into a single apply/undo step
+        self.apply_timer = QtCore.QTimer(self)
+        self.apply_timer.setSingleShot(True)
+        self.apply_timer.setInterval(150)
+        self.apply_timer.timeout.connect(self.apply)
+
+        for widget in self.live_fields:
+            widget.textChanged.connect(self.apply_timer.start)
 
         self.apply()
-        self.update_hash()
+        self.update_saved()
 
     @property
     def filename(self):
@@ -452,157 +506,105 @@ class AlbumEditor(QMainWindow):
     def filename(self, path):
         self.path_delegate.filename = path
 
-    def update_hash(self):
-        """ Update the fingerprint hash """
-        old_hash = self.save_hash
-        self.save_hash = hash(repr(self.data))
-        LOGGER.debug("updating hash from %s to %s", old_hash, self.save_hash)
+    def update_saved(self):
+        """ Record the current data as the saved state """
+        self.saved_data = copy.deepcopy(self.data)
 
     def unsaved(self):
         """ Returns whether there are unsaved changes """
-        current_hash = hash(repr(self.data))
-        LOGGER.debug("save_hash=%d cur_hash=%d", self.save_hash, current_hash)
-        return self.save_hash != current_hash
+        return self.data != self.saved_data
 
     def reload(self, path):
         """ Load from the backing storage """
-        with open(path, 'r', encoding='utf8') as file:
-            try:
-                self.data = typing.cast(dict[str, typing.Any], json.load(file))
-                if 'tracks' not in self.data:
-                    raise KeyError('tracks')
-                self.update_hash()
-            except (json.decoder.JSONDecodeError, KeyError, TypeError):
-                err = QErrorMessage(self)
-                err.showMessage("Invalid album JSON file")
-                self.filename = ''
-                self.data = {'tracks': []}
-
-    @property
-    def theme_colors(self) -> typing.Iterable[tuple[widgets.ColorPicker, str, str]]:
-        """ mapping for theme items to color values """
-        return (
-            (self.theme_foreground, 'foreground', '#000000'),
-            (self.theme_background, 'background', '#ffffff'),
-            (self.theme_highlight, 'highlight', '#7f0000'),
-        )
+        try:
+            self.data = typing.cast(dict[str, typing.Any], util.read_json(path))
+            if 'tracks' not in self.data:
+                raise KeyError('tracks')
+            self.update_saved()
+        except (json.decoder.JSONDecodeError, KeyError, TypeError):
+            err = QErrorMessage(self)
+            err.showMessage("Invalid album JSON file")
+            self.filename = ''
+            self.data = {'tracks': []}
 
     def reset(self):
         """ Reset to the saved values """
         LOGGER.debug("AlbumEditor.reset")
 
-        for key, text_field in (
-            ('artist', self.artist),
-            ('title', self.title),
-            ('artist_url', self.artist_url),
-            ('album_url', self.album_url),
-            ('genre', self.genre),
-            ('artwork', self.artwork.file_path),
-            ('composer', self.composer),
-            ('butler_target', self.butler_target),
-            ('butler_prefix', self.butler_prefix),
-        ):
-            text_field.setText(self.data.get(key, ''))
+        # restoring the data isn't an edit, so don't schedule an apply
+        blockers = [QtCore.QSignalBlocker(widget)
+                    for widget in self.live_fields]
+
+        datatypes.reset_text_fields(self.data, self.text_fields)
+        datatypes.reset_text_fields(self.data, self.path_fields)
 
         if 'year' in self.data:
             self.year.setText(str(self.data['year']))
 
         self.track_listing.reset(self.data['tracks'])
 
-        self.do_preview.setCheckState(
-            datatypes.to_checkstate(self.data.get('do_preview', True)))
-        self.do_mp3.setCheckState(
-            datatypes.to_checkstate(self.data.get('do_mp3', True)))
-        self.do_ogg.setCheckState(
-            datatypes.to_checkstate(self.data.get('do_ogg', True)))
-        self.do_flac.setCheckState(
-            datatypes.to_checkstate(self.data.get('do_flac', True)))
-        self.do_zip.setCheckState(
-            datatypes.to_checkstate(self.data.get('do_zip', True)))
-        self.do_cleanup.setCheckState(
-            datatypes.to_checkstate(self.data.get('do_cleanup', True)))
-        self.do_butler.setCheckState(
-            datatypes.to_checkstate(self.data.get('do_butler', True)))
+        datatypes.reset_checkbox_fields(self.data, self.checkbox_fields)
 
         theme = self.data.get('theme', self.data.get('blamscamp', {}))
         for color, key, dfl in self.theme_colors:
             color.setName(theme.get(key, dfl))
         self.user_css.setText(theme.get('user_css', ''))
-        self.hide_footer.setCheckState(
-            datatypes.to_checkstate(theme.get('hide_footer', False)))
+        datatypes.reset_checkbox_fields(theme, self.theme_checkbox_fields)
 
         self.path_delegate.last_directory = self.data.get(
             '_gui', {}).get('lastdir', {})
 
+        for blocker in blockers:
+            blocker.unblock()
+
+    @QtCore.Slot()
     def apply(self):
         """ Apply edits to the saved data """
         LOGGER.debug("AlbumEditor.apply")
 
-        self.record_undo()
+        self.apply_timer.stop()
+        before = self.history_state
 
         relpath = util.make_relative_path(self.filename)
 
-        datatypes.apply_text_fields(self.data, (
-            ('title', self.title),
-            ('genre', self.genre),
-            ('album_url', self.album_url),
-            ('artist_url', self.artist_url),
-            ('artist', self.artist),
-            ('composer', self.composer),
-            ('butler_target', self.butler_target),
-            ('butler_prefix', self.butler_prefix),
-        ))
-
-        datatypes.apply_text_fields(self.data, (
-                                    ('artwork', self.artwork.file_path),
-                                    ),
-                                    relpath)
+        datatypes.apply_text_fields(self.data, self.text_fields)
+        datatypes.apply_text_fields(self.data, self.path_fields, relpath)
 
         datatypes.apply_text_fields(self.data, (
             ('year', self.year),
         ),
             int)
 
-        datatypes.apply_checkbox_fields(self.data, (
-            ('do_preview', self.do_preview, True),
-            ('do_mp3', self.do_mp3, True),
-            ('do_ogg', self.do_ogg, True),
-            ('do_flac', self.do_flac, True),
-            ('do_zip', self.do_zip, True),
-            ('do_cleanup', self.do_cleanup, True),
-            ('do_butler', self.do_butler, True),
-        ))
+        datatypes.apply_checkbox_fields(self.data, self.checkbox_fields)
         self.track_listing.apply()
 
         theme = self.data.setdefault('theme', {})
         datatypes.apply_text_fields(theme, (
             ('user_css', self.user_css.file_path),
         ), relpath)
-        datatypes.apply_checkbox_fields(theme, (
-            ('hide_footer', self.hide_footer, False),
-        ))
+        datatypes.apply_checkbox_fields(theme, self.theme_checkbox_fields)
         for widget, key, dfl in self.theme_colors:
             if widget.name() != dfl:
                 theme[key] = widget.name()
-            elif key in theme:
-                del theme[key]
-
-        datatypes.apply_checkbox_fields(theme, (
-            ('hide_footer', self.hide_footer, False),
-        ))
+            else:
+                theme.pop(key, None)
 
         self.data['_gui'] = {
             'lastdir': self.path_delegate.last_directory
         }
 
+        # only edits that actually changed something get an undo step
+        if json.dumps(self.data) != before[1]:
+            self.record_undo(before)
+
         # update whether the itch.io checkbox is enabled
-        butler_path = get_encode_options().butler_path
-        if bool(butler_path and shutil.which(butler_path)):
-            self.do_butler.setEnabled(True)
-            self.butler_target.setPlaceholderText("username/my-album-name")
-        else:
-            self.do_butler.setEnabled(False)
+        # read-only, so the shared cached options are fine here
+        enabled = _butler_available(_load_encode_options().butler_path)
+        if enabled != self.butler_enabled:
+            self.butler_enabled = enabled
+            self.do_butler.setEnabled(enabled)
             self.butler_target.setPlaceholderText(
+                "username/my-album-name" if enabled else
                 "Configure butler in the application preferences")
 
         self.track_listing.track_editor.update_placeholders(self.data)
@@ -610,18 +612,23 @@ class AlbumEditor(QMainWindow):
     @property
     def history_state(self):
         """ Get the current edit history state """
-        return self.track_listing.current_row, copy.deepcopy(self.data)
+        # album data is always JSON-safe, and the C encoder is much faster
+        # than deepcopy; the string form is also more compact to keep around
+        return self.track_listing.current_row, json.dumps(self.data)
 
     @history_state.setter
     def history_state(self, state):
         """ Apply an edit history state """
         row, data = state
-        self.data = data
+        self.data = json.loads(data)
         self.reset()
         self.track_listing.current_row = row
 
+    @QtCore.Slot()
     def undo_step(self):
         """ Undo one action """
+        if self.apply_timer.isActive():
+            self.apply()
         if self.undo_history:
             LOGGER.debug("Undoing a step")
             self.redo_history.append(self.history_state)
@@ -633,8 +640,11 @@ class AlbumEditor(QMainWindow):
             LOGGER.debug("history size = %d/%d",
                          len(self.undo_history), len(self.redo_history))
 
+    @QtCore.Slot()
     def redo_step(self):
         """ Redo an undone action """
+        if self.apply_timer.isActive():
+            self.apply()
         if self.redo_history:
             LOGGER.debug("Redoing a step")
             self.undo_history.append(self.history_state)
@@ -646,16 +656,20 @@ class AlbumEditor(QMainWindow):
             LOGGER.debug("history size = %d/%d",
                          len(self.undo_history), len(self.redo_history))
 
-    def record_undo(self):
-        """ Record an undo step """
+    def record_undo(self, state=None):
+        """ Record an undo step
+
+        :param state: The history state to record; defaults to the current one
+        """
         LOGGER.debug("Recording undo step")
-        self.undo_history.append(self.history_state)
+        self.undo_history.append(state or self.history_state)
         self.undo_menu.setEnabled(True)
         self.redo_history.clear()
         self.redo_menu.setEnabled(False)
         LOGGER.debug("history size = %d/%d",
                      len(self.undo_history), len(self.redo_history))
 
+    @QtCore.Slot()
     def save(self):
         """ Save the file to disk """
         LOGGER.debug("AlbumEditor.save")
@@ -663,11 +677,11 @@ class AlbumEditor(QMainWindow):
         if not self.filename:
             return self.save_as()
 
-        with open(self.filename, 'w', encoding='utf8') as file:
-            json.dump(self.data, file, indent=3)
-            self.update_hash()
+        util.write_json(self.filename, self.data, indent=3)
+        self.update_saved()
         return True
 
+    @QtCore.Slot()
     def save_as(self):
         """ Save the file and change the name """
         LOGGER.debug("AlbumEditor.save_as")
@@ -679,6 +693,7 @@ class AlbumEditor(QMainWindow):
             "Select your album file",
             os.path.dirname(self.filename) or role.default_directory,
             role.file_filter,
+            options=DIALOG_OPTIONS,
         )
         if path:
             self.renormalize_paths(self.filename, path)
@@ -690,6 +705,7 @@ class AlbumEditor(QMainWindow):
             return True
         return False
 
+    @QtCore.Slot()
     def revert(self):
         """ Revert all changes """
         LOGGER.debug("AlbumEditor.revert")
@@ -711,6 +727,7 @@ class AlbumEditor(QMainWindow):
             self.reload(self.filename)
             self.reset()
 
+    @QtCore.Slot()
     def encode_album(self):
         """ Run the encoder process """
         # pylint:disable=too-many-branches,too-many-statements,too-many-locals
@@ -733,6 +750,7 @@ class AlbumEditor(QMainWindow):
         dialog.setFileMode(QFileDialog.FileMode.Directory)
         dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptOpen)
         dialog.setLabelText(QFileDialog.DialogLabel.Accept, "Encode")
+        dialog.setOptions(DIALOG_OPTIONS)
         if not dialog.exec():
             return
 
@@ -789,13 +807,27 @@ class AlbumEditor(QMainWindow):
 
         LOGGER.debug("renormalize_paths %s %s", old_name, new_name)
 
+        candidates = [self.data['artwork']] if isinstance(
+            self.data.get('artwork'), str) else []
+        for track in self.data['tracks']:
+            candidates += [track[key] for key in ('filename', 'artwork', 'lyrics')
+                           if isinstance(track.get(key), str)]
+        candidates += self.path_delegate.last_directory.values()
+
+        # Probe all the paths at once, so that slow (e.g. network) storage
+        # only costs the latency of the slowest lookup
+        check_paths = {abspath(path) for path in candidates
+                       if not os.path.isabs(path)}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as pool:
+            exists = dict(zip(check_paths, pool.map(os.path.exists, check_paths)))
+
         def renorm(path):
             if os.path.isabs(path):
                 LOGGER.debug("Keeping %s absolute", path)
                 return path
 
             old_abs = abspath(path)
-            if not os.path.exists(old_abs):
+            if not exists.get(old_abs, False):
                 LOGGER.warning(
                     "Not touching nonexisting path %s (%s)", path, old_abs)
                 return path
@@ -823,6 +855,7 @@ class AlbumEditor(QMainWindow):
         })
         LOGGER.debug("after %s", self.path_delegate.last_directory)
 
+    @QtCore.Slot()
     def show_about_box(self):
         """ Show the about box for the app """
         QMessageBox.about(self, "Bandcrash",
@@ -889,7 +922,8 @@ class BandcrashApplication(QApplication):
         path, _ = QFileDialog.getOpenFileName(None,
                                               "Open album",
                                               role.default_directory,
-                                              role.file_filter)
+                                              role.file_filter,
+                                              options=DIALOG_OPTIONS)
         if path or or_new:
             if path:
                 role.default_directory = os.path.dirname(path)
@@ -905,6 +939,7 @@ class BandcrashApplication(QApplication):
         """ Release a previously-opened editor """
         self.windows.remove(editor)
 
+    @QtCore.Slot()
     def open_on_startup(self):
         """ Hacky way to open the file dialog on startup. there must be a better way... """
         if not self.windows:
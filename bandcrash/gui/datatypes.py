@@ -8,10 +8,24 @@ from PySide6.QtWidgets import QCheckBox, QLineEdit, QRadioButton
 TrackData = dict[str, typing.Any]
 TrackList = list[TrackData]
 
+CHECK_STATES = (Qt.CheckState.Unchecked, Qt.CheckState.Checked)
+
 
 def to_checkstate(val):
     """ Convert a bool to a qt CheckState """
-    return Qt.CheckState.Checked if val else Qt.CheckState.Unchecked
+    return CHECK_STATES[bool(val)]
+
+
+def reset_text_fields(data, fields: typing.Iterable[tuple[str, QLineEdit]]):
+    """ Reset textbox controls from backing storage
+
+    :param dict data: Source dictionary
+    :param list fields: List of (dict_key, widget)
+    """
+    for key, widget in fields:
+        value = data.get(key, '')
+        if widget.text() != value:
+            widget.setText(value)
 
 
 def apply_text_fields(data, fields: typing.Iterable[tuple[str, QLineEdit]],
@@ -24,8 +38,20 @@ def apply_text_fields(data, fields: typing.Iterable[tuple[str, QLineEdit]],
     for key, widget in fields:
         if value := widget.text():
             data[key] = xform(value)
-        elif key in data:
-            del data[key]
+        else:
+            data.pop(key, None)
+
+
+def reset_checkbox_fields(data, fields: typing.Iterable[tuple[str, QCheckBox, bool]]):
+    """ Reset checkbox controls from backing storage
+
+    :param dict data: Source dictionary
+    :param list fields: List of (dict_key, widget, default)
+    """
+    for key, widget, dfl in fields:
+        state = to_checkstate(data.get(key, dfl))
+        if widget.checkState() != state:
+            widget.setCheckState(state)
 
 
 def apply_checkbox_fields(data, fields: typing.Iterable[tuple[str, QCheckBox, bool]]):
@@ -35,11 +61,11 @@ def apply_checkbox_fields(data, fields: typing.Iterable[tuple[str, QCheckBox, bo
     :param list fields: List of (dict_key, widget, default)
     """
     for key, widget, dfl in fields:
-        value = widget.checkState() == Qt.CheckState.Checked
+        value = widget.isChecked()
         if value != dfl:
             data[key] = value
-        elif key in data:
-            del data[key]
+        else:
+            data.pop(key, None)
 
 
 def apply_radio_fields(data,
@@ -49,5 +75,5 @@ def apply_radio_fields(data,
         value = widget.isChecked()
         if value != dfl:
             data[key] = value
-        elif key in data:
-            del data[key]
+        else:
+            data.pop(key, None)
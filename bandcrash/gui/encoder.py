@@ -4,7 +4,7 @@ import concurrent.futures
 import itertools
 import logging
 
-from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtCore import Qt, QTimer, Signal, Slot
 from PySide6.QtWidgets import QDialog, QFormLayout, QProgressBar, QPushButton
 
 from .. import process
@@ -46,7 +46,7 @@ class _Encoder(QDialog):
 
     def exec_(self):
         LOGGER.debug("overridden exec")
-        for future in list(itertools.chain(*self.futures.values())):
+        for future in list(itertools.chain.from_iterable(self.futures.values())):
             future.add_done_callback(self.signal.emit)
 
         # If everything finishes before the dialog presents itself, the thing
@@ -56,15 +56,17 @@ class _Encoder(QDialog):
         LOGGER.debug("parent exec")
         return super().exec_()
 
+    @Slot()
     def stop(self):
         """ End an encode due to error or cancelation """
         LOGGER.warning("Stopping encode")
         self.pool.shutdown(cancel_futures=True)
         self.reject()
 
+    @Slot()
     def check_finished(self):
         """ Watchdog to make sure we aren't waiting on an already-complete futures queue """
-        for task in list(itertools.chain(*self.futures.values())):
+        for task in list(itertools.chain.from_iterable(self.futures.values())):
             if not task.done():
                 return
 
@@ -73,6 +75,7 @@ class _Encoder(QDialog):
         else:
             self.accept()
 
+    @Slot(concurrent.futures.Future)
     def update_progress(self, future):
         """ Update the progress """
         LOGGER.debug("Got update for future %s", future)
@@ -6,12 +6,16 @@ import logging
 import os.path
 
 from PySide6.QtCore import QSettings, QStandardPaths, QUrl
+from PySide6.QtWidgets import QFileDialog
 
 from .. import images
 
 LOGGER = logging.getLogger(__name__)
 ACCEPT_AUDIO_EXTS = ('.wav', '.ogg', '.flac', '.mp3', '.aif', '.aiff')
 
+# Skip the per-entry custom icon lookups, which are slow on large or network directories
+DIALOG_OPTIONS = QFileDialog.Option.DontUseCustomDirectoryIcons
+
 
 class FileRole(enum.Enum):
     """ File roles, for file selector widgets """
@@ -6,7 +6,7 @@ import os
 import os.path
 import typing
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QSignalBlocker, Qt, Slot
 from PySide6.QtWidgets import (QAbstractItemView, QAbstractScrollArea,
                                QButtonGroup, QCheckBox, QFileDialog,
                                QFormLayout, QHBoxLayout, QLineEdit,
@@ -16,7 +16,7 @@ from PySide6.QtWidgets import (QAbstractItemView, QAbstractScrollArea,
 
 from .. import util
 from . import datatypes, file_utils
-from .file_utils import FileRole
+from .file_utils import DIALOG_OPTIONS, FileRole
 from .widgets import FileSelector, FlowLayout, wrap_layout
 
 LOGGER = logging.getLogger(__name__)
@@ -31,6 +31,7 @@ class TrackEditor(QScrollArea):
 
         :param dict data: The metadata blob
         """
+        # pylint:disable=too-many-statements
         super().__init__()
         self.setMinimumSize(400, 0)
 
@@ -93,27 +94,71 @@ class TrackEditor(QScrollArea):
         layout.addRow("Track comment", self.comment)
         layout.addRow("Track details", self.about)
 
-    def reset(self, data: datatypes.TrackData):
-        """ Reset to the specified backing data """
-        self.data = data
-        self.setEnabled(data is not None)
-
-        for key, widget in (
-            ('filename', self.filename.file_path),
+        # (data key, widget) mappings shared by reset() and apply()
+        self.path_fields = (
+            ('filename', self.filename),
+            ('artwork', self.artwork),
+        )
+        self.text_fields = (
             ('title', self.title),
             ('genre', self.genre),
             ('artist', self.artist),
             ('composer', self.composer),
             ('cover_of', self.cover_of),
-            ('artwork', self.artwork.file_path),
             ('group', self.group),
             ('comment', self.comment),
-        ):
-            widget.setText(self.data.get(key, ''))
+        )
+        self.document_fields = (
+            ('lyrics', self.lyrics),
+            ('about', self.about),
+        )
+        self.radio_fields = (
+            ('preview', self.preview, True),
+            ('hidden', self.hidden, False),
+        )
+        self.checkbox_fields = (
+            ('explicit', self.explicit, False),
+        )
+
+        # track whether anything has been edited since the last reset/apply
+        self.dirty = False
+        for _, selector in self.path_fields:
+            selector.file_path.textChanged.connect(self.mark_dirty)
+        for _, widget in (*self.text_fields, *self.document_fields):
+            widget.textChanged.connect(self.mark_dirty)
+        for widget in (self.preview, self.listed, self.hidden):
+            widget.toggled.connect(self.mark_dirty)
+        self.explicit.stateChanged.connect(self.mark_dirty)
+
+        # everything whose change notifications feed mark_dirty
+        self.edit_widgets = (
+            *(selector.file_path for _, selector in self.path_fields),
+            *(widget for _, widget in self.text_fields),
+            *(widget for _, widget in self.document_fields),
+            self.preview, self.listed, self.hidden, self.explicit,
+        )
+
+    @Slot()
+    def mark_dirty(self):
+        """ Signal handler for any edit to the track """
+        self.dirty = True
 
-        self.lyrics.document().setPlainText(
-            util.text_to_lines(self.data.get('lyrics', '')))
-        self.about.document().setPlainText(util.text_to_lines(self.data.get('about', '')))
+    def reset(self, data: datatypes.TrackData):
+        """ Reset to the specified backing data """
+        self.data = data
+        self.setEnabled(data is not None)
+
+        # None of the edits below are user changes, so don't notify on them
+        blockers = [QSignalBlocker(widget) for widget in self.edit_widgets]
+
+        datatypes.reset_text_fields(self.data, self.path_fields)
+        datatypes.reset_text_fields(self.data, self.text_fields)
+
+        for key, widget in self.document_fields:
+            document = widget.document()
+            document.setPlainText(util.text_to_lines(self.data.get(key, '')))
+            # apply() uses this to tell whether the user has edited it
+            document.setModified(False)
 
         hidden = self.data.get('hidden', False)
         preview = self.data.get('preview', True) and not hidden
@@ -123,8 +168,11 @@ class TrackEditor(QScrollArea):
         self.preview.setChecked(preview)
         self.listed.setChecked(listed)
 
-        self.explicit.setCheckState(
-            datatypes.to_checkstate(self.data.get('explicit', False)))
+        datatypes.reset_checkbox_fields(self.data, self.checkbox_fields)
+
+        for blocker in blockers:
+            blocker.unblock()
+        self.dirty = False
 
     def apply(self):
         """ Apply our data to the backing data """
@@ -134,47 +182,36 @@ class TrackEditor(QScrollArea):
             LOGGER.debug("TrackEditor apply - no data")
             return
 
+        if not self.dirty:
+            return
+
         LOGGER.debug("TrackEditor.apply %s", self.data.get('filename'))
 
         relpath = util.make_relative_path(self.path_delegate.filename)
 
-        datatypes.apply_text_fields(self.data, (
-            ('filename', self.filename.file_path),
-            ('artwork', self.artwork.file_path),
-        ), relpath)
-
-        datatypes.apply_text_fields(self.data, (
-            ('title', self.title),
-            ('genre', self.genre),
-            ('artist', self.artist),
-            ('composer', self.composer),
-            ('cover_of', self.cover_of),
-            ('group', self.group),
-            ('comment', self.comment),
-        ))
+        datatypes.apply_text_fields(self.data, self.path_fields, relpath)
+        datatypes.apply_text_fields(self.data, self.text_fields)
 
         def split_lines(text):
-            lines = text.split('\n')
-            return lines if len(lines) != 1 else text
-
-        for key, widget in (
-            ('lyrics', self.lyrics),
-            ('about', self.about),
-        ):
-            lines = split_lines(widget.document().toPlainText())
+            return text.split('\n') if '\n' in text else text
+
+        for key, widget in self.document_fields:
+            document = widget.document()
+            if not document.isModified():
+                # reset() clears the flag, so this is still what's in the
+                # backing data
+                continue
+            document.setModified(False)
+            lines = split_lines(document.toPlainText())
             if lines:
                 self.data[key] = lines
-            elif key in self.data:
-                del self.data[key]
+            else:
+                self.data.pop(key, None)
 
-        datatypes.apply_radio_fields(self.data, (
-            ('preview', self.preview, True),
-            ('hidden', self.hidden, False),
-        ))
+        datatypes.apply_radio_fields(self.data, self.radio_fields)
+        datatypes.apply_checkbox_fields(self.data, self.checkbox_fields)
 
-        datatypes.apply_checkbox_fields(self.data, (
-            ('explicit', self.explicit, False),
-        ))
+        self.dirty = False
 
         LOGGER.debug("applied: %s", self.data)
 
@@ -214,19 +251,19 @@ class TrackListEditor(QSplitter):
 
             :param list data: album['data']
             """
-            LOGGER.debug("TrackItem.reset %s", self.display_name)
             self.track_number = track_num
             self.track_data = data
             self.update_name()
 
         def apply(self):
             """ Apply the GUI values to the backing store """
-            LOGGER.debug("TrackItem.apply %s", self.display_name)
             self.update_name()
 
         def update_name(self):
             """ Update the display name """
-            self.setText(self.display_name)
+            name = self.display_name
+            if self.text() != name:
+                self.setText(name)
 
         @property
         def display_name(self):
@@ -235,7 +272,12 @@ class TrackListEditor(QSplitter):
             if info and 'title' in info:
                 title = info['title']
             elif info and 'filename' in info:
-                title = f"({os.path.basename(info['filename'])})"
+                # split on either separator, since the album may have been
+                # saved on another platform
+                filename = info['filename']
+                basename = filename[max(filename.rfind('/'),
+                                        filename.rfind('\\')) + 1:]
+                title = f"({basename})"
             else:
                 title = "(unknown)"
 
@@ -340,6 +382,9 @@ class TrackListEditor(QSplitter):
             LOGGER.warning("Sync error: Track listing had %d, expected %d",
                            self.track_listing.count(), len(data))
 
+        # batch the listing changes into a single repaint
+        self.track_listing.setUpdatesEnabled(False)
+
         for idx, track in enumerate(data):
             item = typing.cast(TrackListEditor.TrackItem,
                                self.track_listing.item(idx))
@@ -352,6 +397,8 @@ class TrackListEditor(QSplitter):
         while self.track_listing.count() > len(data):
             self.track_listing.takeItem(self.track_listing.count() - 1)
 
+        self.track_listing.setUpdatesEnabled(True)
+
         self.data = data
 
         if current_row != self.track_listing.currentRow():
@@ -370,9 +417,9 @@ class TrackListEditor(QSplitter):
                                self.track_listing.item(row))
             item.set_track_num(row)
             item.apply()
-            LOGGER.debug("  -- append %s", item.display_name)
             self.data.append(item.track_data)
 
+    @Slot(int)
     def set_item(self, row):
         """ Signal handler for row change """
         LOGGER.debug("TrackListEditor.set_item")
@@ -386,6 +433,7 @@ class TrackListEditor(QSplitter):
             self.track_editor.reset({})
             self.track_editor.setEnabled(False)
 
+    @Slot()
     def add_track_button(self):
         """ Prompt to add some tracks """
         LOGGER.debug("TrackListEditor.add_tracks")
@@ -395,7 +443,8 @@ class TrackListEditor(QSplitter):
             self,
             "Select audio files",
             dir=self.path_delegate.get_last_directory(role),
-            filter=role.file_filter)
+            filter=role.file_filter,
+            options=DIALOG_OPTIONS)
 
         if filenames:
             # update the audio role selection path
@@ -421,14 +470,17 @@ class TrackListEditor(QSplitter):
         """ Accepts files into the track listing """
         LOGGER.debug("TrackListEditor.add_files")
         self.album_editor.record_undo()
+        self.track_listing.setUpdatesEnabled(False)
         for filename in filenames:
             _, title = util.guess_track_title(filename)
             track = {'filename': filename, 'title': title}
             self.track_listing.addItem(
                 TrackListEditor.TrackItem(len(self.data), track))
             self.data.append(track)
+        self.track_listing.setUpdatesEnabled(True)
         self.apply()
 
+    @Slot()
     def delete_track(self):
         """ Remove a track """
         LOGGER.debug("TrackListEditor.delete_track")
@@ -436,18 +488,21 @@ class TrackListEditor(QSplitter):
         self.track_listing.takeItem(self.track_listing.currentRow())
         self.apply()
 
+    @Slot()
     def select_previous(self):
         """ Select the previous track """
         current_row = self.track_listing.currentRow()
         if current_row > 0:
             self.track_listing.setCurrentRow(current_row - 1)
 
+    @Slot()
     def select_next(self):
         """ Select the next track """
         current_row = self.track_listing.currentRow()
         if current_row + 1 < self.track_listing.count():
             self.track_listing.setCurrentRow(current_row + 1)
 
+    @Slot()
     def move_up(self):
         """ Move the currently-selected track up in the track listing """
         LOGGER.debug("TrackListEditor.move_up")
@@ -455,10 +510,13 @@ class TrackListEditor(QSplitter):
         row = self.track_listing.currentRow()
         if row > 0:
             dest = row - 1
+            self.track_listing.setUpdatesEnabled(False)
             item = self.track_listing.takeItem(row)
             self.track_listing.insertItem(dest, item)
             self.track_listing.setCurrentRow(dest)
+            self.track_listing.setUpdatesEnabled(True)
 
+    @Slot()
     def move_down(self):
         """ Move the currently-selected track up in the track listing """
         LOGGER.debug("TrackListEditor.move_down")
@@ -466,6 +524,8 @@ class TrackListEditor(QSplitter):
         row = self.track_listing.currentRow()
         if row < self.track_listing.count() - 1:
             dest = row + 1
+            self.track_listing.setUpdatesEnabled(False)
             item = self.track_listing.takeItem(row)
             self.track_listing.insertItem(dest, item)
             self.track_listing.setCurrentRow(dest)
+            self.track_listing.setUpdatesEnabled(True)
@@ -4,14 +4,14 @@ import logging
 import os
 import os.path
 
-from PySide6.QtCore import QMargins, QPoint, QRect, QSize, Qt
+from PySide6.QtCore import QMargins, QPoint, QRect, QSize, Qt, Slot
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (QColorDialog, QDialog, QFileDialog, QHBoxLayout,
                                QLabel, QLayout, QLineEdit, QPlainTextEdit,
                                QPushButton, QSizePolicy, QVBoxLayout, QWidget)
 
 from .. import util
-from .file_utils import FileRole
+from .file_utils import DIALOG_OPTIONS, FileRole
 
 LOGGER = logging.getLogger(__name__)
 
@@ -45,6 +45,7 @@ class FileSelector(QWidget):
 
         self.button.clicked.connect(self.choose_file)
 
+    @Slot()
     def choose_file(self):
         """ Pick a file """
 
@@ -61,7 +62,8 @@ class FileSelector(QWidget):
         (filename, _) = QFileDialog.getOpenFileName(self,
                                                     f'Select your {self.role.name}',
                                                     start_dir,
-                                                    self.role.file_filter)
+                                                    self.role.file_filter,
+                                                    options=DIALOG_OPTIONS)
         if filename:
             # Update the global default for files of this role
             filedir = os.path.dirname(filename)
@@ -198,7 +200,7 @@ class ColorPicker(QWidget):
         self._button = QPushButton()
         self._button.setAutoFillBackground(True)
 
-        self.setName('#000000')
+        self.setValue(self._value)
 
         self._button.clicked.connect(self.pickColor)
 
@@ -208,6 +210,7 @@ class ColorPicker(QWidget):
         hbox.addWidget(self._button)
         self.setLayout(hbox)
 
+    @Slot()
     def pickColor(self):  # pylint:disable=invalid-name
         """ Pick a color """
         color = QColorDialog.getColor(self._value)
@@ -233,7 +236,10 @@ class ColorPicker(QWidget):
 
     def setName(self, name):  # pylint:disable=invalid-name
         """ Set the color value by hex string """
-        self.setValue(QColor.fromString(name))
+        color = QColor.fromString(name)
+        if color != self._value:
+            # restyling the button is comparatively expensive
+            self.setValue(color)
 
 
 class ErrorMessage(QDialog):
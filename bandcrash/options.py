@@ -1,6 +1,7 @@
 """ Encoder options """
 
 import dataclasses
+import functools
 import os
 import shutil
 import typing
@@ -100,6 +101,7 @@ class Options:
     butler_prefix: typing.Optional[str] = None
 
 
+@functools.lru_cache()
 def fields():
     """ Get the dataclass fields """
     return dataclasses.fields(Options)
@@ -1,17 +1,26 @@
 """ Common functions """
+import contextlib
 import functools
 import hashlib
+import json
 import logging
 import os
 import os.path
 import re
+import shutil
 import string
 import subprocess
+import tempfile
 import typing
 
 import chardet
 from unidecode import unidecode
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -63,6 +72,56 @@ def read_lines(fname: str) -> typing.List[str]:
             return [line.rstrip() for line in file]
 
 
+def read_json(fname: str) -> typing.Any:
+    """ Load a JSON file, using orjson if it's available """
+    with open(fname, 'rb') as file:
+        raw = file.read()
+
+    if orjson:
+        try:
+            return orjson.loads(raw)  # pylint:disable=no-member
+        except orjson.JSONDecodeError:  # pylint:disable=no-member
+            # orjson is stricter than json (no NaN/Infinity, no integers
+            # wider than 64 bits), so let json have the final say
+            pass
+
+    return json.loads(raw.decode('utf8'))
+
+
+def write_json(fname: str, data, indent=None):
+    """ Save a JSON file, replacing any existing file atomically """
+    # write through symlinks rather than replacing the link itself
+    fname = os.path.realpath(fname)
+
+    if not os.path.exists(fname):
+        # there's nothing to protect, so just create it normally
+        with open(fname, 'w', encoding='utf8') as file:
+            json.dump(data, file, indent=indent)
+        return
+
+    # a unique name, so that concurrent saves can't clobber each other
+    file = tempfile.NamedTemporaryFile('w', encoding='utf8',
+                                       dir=os.path.dirname(fname),
+                                       prefix=f'.{os.path.basename(fname)}.',
+                                       suffix='.tmp',
+                                       delete=False)
+    try:
+        with file:
+            json.dump(data, file, indent=indent)
+            file.flush()
+            os.fsync(file.fileno())
+        # the temp file is created private; keep the original's permissions
+        shutil.copymode(fname, file.name)
+    except BaseException:
+        # don't leave a partial file lying around next to the original
+        with contextlib.suppress(OSError):
+            os.unlink(file.name)
+        raise
+
+    os.replace(file.name, fname)
+
+
+@functools.lru_cache(maxsize=32)
 def make_absolute_path(base_file):
     """
     Returns a function to provide an absolute path for the specified
@@ -82,6 +141,7 @@ def make_absolute_path(base_file):
                          else os.path.normpath(os.path.join(dirname, path)))
 
 
+@functools.lru_cache(maxsize=32)
 def make_relative_path(base_file):
     """
     Returns a function to provide a path relative to the specified filename
@@ -97,9 +157,15 @@ def make_relative_path(base_file):
     else:
         dirname = os.path.dirname(base_file)
 
+    # Paths inside the base directory (the common case) can just have the
+    # prefix sliced off; this never matches a root directory
+    prefix = os.path.abspath(dirname) + os.path.sep if dirname else None
+
     def normalize(path):
         abspath = os.path.realpath(path) if os.path.isabs(
             path) else os.path.realpath(os.path.join(dirname, path))
+        if prefix and abspath.startswith(prefix):
+            return abspath[len(prefix):]
         try:
             relpath = os.path.relpath(abspath, dirname)
         except ValueError: